@@ -3,10 +3,78 @@
 Create Lambda layer with dependencies
 """
 
+import hashlib
 import os
+from functools import lru_cache
+import shutil
 import subprocess
 import zipfile
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+from deploy_aws import iter_files
+
+# Shared client configuration (connection pooling and adaptive retries)
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
+# Multipart upload settings for staging artifacts in S3
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# Pinned layer dependencies and the local cache of installed copies
+LAYER_REQUIREMENTS = [
+    "Pillow==10.0.0",
+    "requests==2.31.0",
+    "pybase64==1.4.0",
+    "streaming-form-data==1.13.0",
+    "orjson==3.9.10"
+]
+LAYER_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "lambda-layers")
+
+@lru_cache(maxsize=None)
+def get_client(service, region='us-east-1'):
+    """Return a cached boto3 client built from a single per-region session"""
+    return _get_session(region).client(service, config=CLIENT_CONFIG)
+
+@lru_cache(maxsize=None)
+def _get_session(region):
+    """Return the boto3 session for a region"""
+    return boto3.Session(region_name=region)
+
+def get_requirements_hash():
+    """Content hash of the pinned layer requirements"""
+    return hashlib.sha256("\n".join(LAYER_REQUIREMENTS).encode()).hexdigest()
+
+def install_dependencies(python_dir):
+    """Install layer dependencies into python_dir, reusing a cached install when available"""
+    cache_dir = os.path.join(LAYER_CACHE_DIR, get_requirements_hash(), "python")
+    
+    if os.path.isdir(cache_dir):
+        print("♻️ Using cached dependencies...")
+    else:
+        print("📥 Installing dependencies...")
+        staging_dir = f"{cache_dir}.tmp"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+        subprocess.run([
+            "pip3", "install",
+            *LAYER_REQUIREMENTS,
+            "--no-compile",
+            "--only-binary=:all:",
+            "-t", staging_dir
+        ], check=True)
+        # Only publish the cache entry once the install has fully succeeded
+        os.replace(staging_dir, cache_dir)
+    
+    shutil.copytree(cache_dir, python_dir, dirs_exist_ok=True)
 
 def create_dependencies_layer():
     """Create a Lambda layer with required dependencies"""
@@ -17,51 +85,93 @@ def create_dependencies_layer():
     python_dir = os.path.join(layer_dir, "python")
     
     # Clean up existing directory
-    if os.path.exists(layer_dir):
-        subprocess.run(["rm", "-rf", layer_dir])
+    shutil.rmtree(layer_dir, ignore_errors=True)
     
     os.makedirs(python_dir, exist_ok=True)
     
     # Install dependencies to the layer directory
-    print("📥 Installing dependencies...")
-    subprocess.run([
-        "pip3", "install", 
-        "Pillow==10.0.0",
-        "requests==2.31.0",
-        "-t", python_dir
-    ], check=True)
+    install_dependencies(python_dir)
     
     # Create layer zip
     layer_zip = "lambda_layer.zip"
     print(f"🗜️ Creating {layer_zip}...")
     
-    with zipfile.ZipFile(layer_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(layer_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, layer_dir)
-                zipf.write(file_path, arcname)
+    with zipfile.ZipFile(layer_zip, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        prefix_len = len(layer_dir) + 1
+        for entry in iter_files(layer_dir):
+            zipf.write(entry.path, entry.path[prefix_len:])
     
     # Clean up temporary directory
-    subprocess.run(["rm", "-rf", layer_dir])
+    shutil.rmtree(layer_dir, ignore_errors=True)
     
     print(f"✅ Created layer package: {layer_zip}")
     return layer_zip
 
-def upload_layer(layer_zip, region='us-east-1'):
-    """Upload layer to AWS Lambda"""
-    print("☁️ Uploading layer to AWS Lambda...")
+def get_staging_bucket(region='us-east-1'):
+    """Return the S3 bucket used to stage deployment artifacts, creating it if needed"""
+    s3_client = get_client('s3', region)
+    
+    bucket = os.environ.get('LICENSE_SCANNER_STAGING_BUCKET')
+    if not bucket:
+        account_id = get_client('sts', region).get_caller_identity()['Account']
+        bucket = f"license-scanner-artifacts-{account_id}-{region}"
+    
+    try:
+        s3_client.head_bucket(Bucket=bucket)
+    except s3_client.exceptions.ClientError:
+        print(f"🪣 Creating staging bucket: {bucket}")
+        if region == 'us-east-1':
+            s3_client.create_bucket(Bucket=bucket)
+        else:
+            s3_client.create_bucket(
+                Bucket=bucket,
+                CreateBucketConfiguration={'LocationConstraint': region}
+            )
+    
+    return bucket
+
+def stage_layer(region='us-east-1'):
+    """
+    Make sure the layer zip for the pinned requirements is staged in S3
+    
+    The object key is the requirements hash, so the layer is only built and
+    uploaded when the requirements change.
+    
+    Returns:
+        Tuple of (bucket, key) of the staged layer zip
+    """
+    s3_client = get_client('s3', region)
+    bucket = get_staging_bucket(region)
+    key = f"layers/{get_requirements_hash()}.zip"
+    
+    try:
+        s3_client.head_object(Bucket=bucket, Key=key)
+        print(f"♻️ Reusing staged layer: s3://{bucket}/{key}")
+        return bucket, key
+    except s3_client.exceptions.ClientError:
+        pass  # Not staged yet
+    
+    layer_zip = create_dependencies_layer()
+    try:
+        # Stream the zip from disk in parallel parts
+        print("☁️ Uploading layer package to S3...")
+        s3_client.upload_file(layer_zip, bucket, key, Config=TRANSFER_CONFIG)
+    finally:
+        os.remove(layer_zip)
     
-    lambda_client = boto3.client('lambda', region_name=region)
+    return bucket, key
+
+def upload_layer(bucket, key, region='us-east-1'):
+    """Publish the staged layer to AWS Lambda"""
+    print("☁️ Publishing layer to AWS Lambda...")
     
-    with open(layer_zip, 'rb') as f:
-        layer_content = f.read()
+    lambda_client = get_client('lambda', region)
     
     try:
         response = lambda_client.publish_layer_version(
             LayerName='license-scanner-dependencies',
-            Description='Dependencies for License Scanner (Pillow, requests)',
-            Content={'ZipFile': layer_content},
+            Description='Dependencies for License Scanner (Pillow, requests, pybase64, streaming-form-data, orjson)',
+            Content={'S3Bucket': bucket, 'S3Key': key},
             CompatibleRuntimes=['python3.9', 'python3.10', 'python3.11'],
             CompatibleArchitectures=['x86_64']
         )
@@ -78,9 +188,15 @@ def update_function_with_layer(layer_arn, region='us-east-1'):
     """Update Lambda function to use the layer"""
     print("🔗 Updating Lambda function with layer...")
     
-    lambda_client = boto3.client('lambda', region_name=region)
+    lambda_client = get_client('lambda', region)
     
     try:
+        # Wait for any in-flight code/config update to settle before changing layers
+        lambda_client.get_waiter('function_updated_v2').wait(
+            FunctionName='license-scanner-api',
+            WaiterConfig={'Delay': 1, 'MaxAttempts': 30}
+        )
+        
         response = lambda_client.update_function_configuration(
             FunctionName='license-scanner-api',
             Layers=[layer_arn]
@@ -99,18 +215,15 @@ def main():
     print("=" * 50)
     
     try:
-        # Step 1: Create layer package
-        layer_zip = create_dependencies_layer()
+        # Step 1: Create and stage layer package (skipped if already staged)
+        bucket, key = stage_layer()
         
-        # Step 2: Upload layer to AWS
-        layer_arn = upload_layer(layer_zip)
+        # Step 2: Publish layer to AWS
+        layer_arn = upload_layer(bucket, key)
         
         # Step 3: Update function to use layer
         function_arn = update_function_with_layer(layer_arn)
         
-        # Clean up
-        os.remove(layer_zip)
-        
         print("\n" + "=" * 50)
         print("🎉 Layer deployment completed!")
         print(f"📦 Layer ARN: {layer_arn}")
@@ -3,9 +3,14 @@
 Demo script showing improved license number extraction capabilities
 """
 
-from drivers_license_scanner import DriversLicenseScanner
+import sys
 import os
 
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from license_scanner.scanner import DriversLicenseScanner
+
 def demo_extraction_patterns():
     """Demonstrate various license number extraction patterns"""
     
@@ -28,8 +33,9 @@ def demo_extraction_patterns():
     ]
     
     print("\n📋 Testing extraction patterns:")
-    for text, state, description in test_cases:
-        result = scanner.extract_license_number(text, state)
+    texts, states, descriptions = zip(*test_cases)
+    results = scanner.extract_license_numbers(texts, states)
+    for text, description, result in zip(texts, descriptions, results):
         status = "✅" if result else "❌"
         print(f"  {status} {description}")
         print(f"      Input: '{text}'")
@@ -4,79 +4,349 @@ AWS Deployment script for the Driver's License Scanner
 """
 
 import boto3
+import hashlib
+import importlib.util
+import io
 import json
+import marshal
+import sys
 import zipfile
 import os
 import time
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+from botocore.config import Config
+
+# IAM policy documents, serialized once
+TRUST_POLICY_JSON = json.dumps({
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Principal": {
+                "Service": "lambda.amazonaws.com"
+            },
+            "Action": "sts:AssumeRole"
+        }
+    ]
+})
+
+TEXTRACT_POLICY_JSON = json.dumps({
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Action": [
+                "textract:DetectDocumentText"
+            ],
+            "Resource": "*"
+        }
+    ]
+})
+
+# Backoff schedule (seconds) while waiting for a new IAM role to become assumable
+ROLE_PROPAGATION_DELAYS = (0.5, 1, 2, 4, 8)
+
+# Poll Lambda state every second while waiting for updates to settle
+FUNCTION_WAITER_CONFIG = {'Delay': 1, 'MaxAttempts': 30}
+
+# Fixed timestamp so identical sources always produce identical archives
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Part size for streaming packages into S3 multipart uploads
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# Zip settings per --compression mode: (compress_type, compresslevel)
+COMPRESSION_MODES = {
+    'store': (zipfile.ZIP_STORED, None),
+    'deflate': (zipfile.ZIP_DEFLATED, 1),
+    'max': (zipfile.ZIP_DEFLATED, 9),
+}
+
+# Upload bandwidth thresholds (bytes/s) used by --compression auto
+FAST_UPLOAD_BYTES_PER_SEC = 50 * 1024 * 1024
+SLOW_UPLOAD_BYTES_PER_SEC = 5 * 1024 * 1024
+BANDWIDTH_PROBE_BYTES = 1024 * 1024
+
+# Lambda runtime; bytecode is only precompiled when the local interpreter matches it
+LAMBDA_RUNTIME = 'python3.9'
+
+# pyc flags for hash-based bytecode that is never checked against its source
+UNCHECKED_HASH_PYC_FLAGS = 0b01
+
+# Directories and file suffixes that are never shipped to Lambda
+EXCLUDED_DIRS = {'__pycache__', 'tests', 'test'}
+EXCLUDED_SUFFIXES = ('.pyc', '.pyo', '.so.debug')
+
+def is_runtime_file(entry) -> bool:
+    """Check whether a file is needed at runtime (not bytecode, debug symbols or install records)"""
+    if entry.name.endswith(EXCLUDED_SUFFIXES):
+        return False
+    return not (entry.name == 'RECORD' and entry.path.endswith('.dist-info' + os.sep + 'RECORD'))
+
+def iter_files(root: str):
+    """Yield DirEntry objects for runtime files under root, skipping caches and tests"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDED_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and is_runtime_file(entry):
+                    yield entry
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Write-only stream that uploads to S3 as a multipart upload
+    
+    Data is buffered into fixed-size parts which are uploaded from a thread
+    pool while the caller keeps writing. Closing the stream completes the
+    upload; leaving a ``with`` block on an exception aborts it.
+    """
+    
+    def __init__(self, s3_client, bucket: str, key: str,
+                 part_size: int = MULTIPART_PART_SIZE, max_workers: int = 10):
+        super().__init__()
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key)['UploadId']
+        
+        self._buffer = bytearray()
+        self._position = 0
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+    
+    def writable(self) -> bool:
+        return True
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._submit_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+        return len(data)
+    
+    def _submit_part(self, body: bytes) -> None:
+        # Bound memory by waiting on the oldest in-flight part
+        if len(self._futures) >= self.max_workers:
+            self._futures[-self.max_workers].result()
+        part_number = len(self._futures) + 1
+        self._futures.append(self._executor.submit(self._upload_part, part_number, body))
+    
+    def _upload_part(self, part_number: int, body: bytes) -> Dict[str, Any]:
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        return {'PartNumber': part_number, 'ETag': response['ETag']}
+    
+    def close(self) -> None:
+        """Flush the last part and complete the upload"""
+        if self.closed:
+            return
+        try:
+            # The final part may be smaller than the minimum part size
+            if self._buffer or not self._futures:
+                self._submit_part(bytes(self._buffer))
+                self._buffer.clear()
+            parts = [future.result() for future in self._futures]
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown(wait=True)
+            super().close()
+    
+    def abort(self) -> None:
+        """Abort the multipart upload, discarding any uploaded parts"""
+        if self.closed:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.s3_client.abort_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id
+        )
+        super().close()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
 
 class AWSDeployer:
-    def __init__(self, region: str = 'us-east-1'):
+    def __init__(self, region: str = 'us-east-1', compression: str = 'deflate'):
         self.region = region
-        self.lambda_client = boto3.client('lambda', region_name=region)
-        self.apigateway_client = boto3.client('apigateway', region_name=region)
-        self.iam_client = boto3.client('iam', region_name=region)
+        self.compression = compression
+        
+        # Share one session (credentials, endpoints) and connection pool across clients
+        self.session = boto3.Session(region_name=region)
+        client_config = Config(
+            max_pool_connections=50,
+            retries={'max_attempts': 10, 'mode': 'adaptive'}
+        )
+        self.lambda_client = self.session.client('lambda', config=client_config)
+        self.apigateway_client = self.session.client('apigateway', config=client_config)
+        self.iam_client = self.session.client('iam', config=client_config)
+        self.s3_client = self.session.client('s3', config=client_config)
+        self.staging_bucket = os.environ.get('LICENSE_SCANNER_STAGING_BUCKET')
+        
+        # .pyc files are interpreter specific, so only ship them when they will load
+        self.precompile = f"python{sys.version_info.major}.{sys.version_info.minor}" == LAMBDA_RUNTIME
         
         # Configuration
         self.function_name = 'license-scanner-api'
         self.role_name = 'license-scanner-lambda-role'
         self.api_name = 'license-scanner-api'
         
-    def create_deployment_package(self) -> str:
-        """Create deployment ZIP package"""
-        print("📦 Creating deployment package...")
+    def _collect_package_files(self) -> List[Tuple[str, str]]:
+        """Build the list of (file_path, arcname) entries for the deployment package"""
+        package_files = [
+            # Lambda handler
+            ('lambda_handler.py', 'lambda_handler.py'),
+            # Lambda-specific API
+            ('lambda_api.py', 'lambda_api.py'),
+        ]
         
-        zip_filename = 'license-scanner-deployment.zip'
+        # Add source code
+        for entry in iter_files('src'):
+            file = entry.name
+            if file.endswith('.py'):
+                file_path = entry.path
+                # Ship the package at the zip root so it is importable without sys.path changes
+                arcname = os.path.relpath(file_path, 'src')
+                
+                # Skip the src/ marker itself, it has no meaning at the zip root
+                if arcname == '__init__.py':
+                    continue
+                
+                # Replace __init__.py with Lambda version
+                root = os.path.dirname(file_path)
+                if file == '__init__.py' and 'license_scanner' in root:
+                    # Use Lambda-specific __init__.py
+                    lambda_init_path = os.path.join(root, '__init___lambda.py')
+                    if os.path.exists(lambda_init_path):
+                        package_files.append((lambda_init_path, arcname))
+                        continue
+                
+                package_files.append((file_path, arcname))
         
-        with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add Lambda handler
-            zipf.write('lambda_handler.py')
-            
-            # Add Lambda-specific API
-            zipf.write('lambda_api.py')
-            
-            # Add source code
-            for root, dirs, files in os.walk('src'):
-                for file in files:
-                    if file.endswith('.py'):
-                        file_path = os.path.join(root, file)
-                        arcname = file_path
-                        
-                        # Skip the regular api.py file (has PIL dependency)
-                        if file == 'api.py':
-                            continue
-                        
-                        # Replace __init__.py with Lambda version
-                        if file == '__init__.py' and 'license_scanner' in root:
-                            # Use Lambda-specific __init__.py
-                            lambda_init_path = os.path.join(root, '__init___lambda.py')
-                            if os.path.exists(lambda_init_path):
-                                zipf.write(lambda_init_path, arcname)
-                                continue
-                        
-                        zipf.write(file_path, arcname)
-            
-            print(f"✅ Created {zip_filename}")
+        return package_files
+    
+    @staticmethod
+    def _package_manifest_hash(package_files: List[Tuple[str, str]], build_tag: str = '') -> str:
+        """Hash the (arcname, mtime, size) manifest of the package sources"""
+        manifest = hashlib.blake2b()
+        manifest.update(f"{build_tag}\n".encode())
+        for file_path, arcname in package_files:
+            stat = os.stat(file_path)
+            manifest.update(f"{arcname}\0{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+        return manifest.hexdigest()
+    
+    @staticmethod
+    def _read_package_file(entry: Tuple[str, str]) -> Tuple[zipfile.ZipInfo, bytes]:
+        """Read a single package file into a deterministic ZipInfo (runs in a worker thread)"""
+        file_path, arcname = entry
+        zinfo = zipfile.ZipInfo(arcname, date_time=ZIP_DATE_TIME)
+        zinfo.external_attr = (os.stat(file_path).st_mode & 0xFFFF) << 16
+        return zinfo, Path(file_path).read_bytes()
+    
+    @staticmethod
+    def _compile_package_file(entry: Tuple[zipfile.ZipInfo, bytes]) -> Tuple[zipfile.ZipInfo, bytes]:
+        """
+        Compile a packaged source file into its __pycache__ .pyc (runs in a worker thread)
+        
+        The bytecode is hash-based and unchecked, so the runtime loads it without
+        comparing it to the source (whose zip timestamps are fixed anyway) and
+        never tries to rewrite it on Lambda's read-only filesystem.
+        """
+        source_info, source = entry
+        code = compile(source, source_info.filename, 'exec', dont_inherit=True)
+        data = (
+            importlib.util.MAGIC_NUMBER
+            + UNCHECKED_HASH_PYC_FLAGS.to_bytes(4, 'little')
+            + importlib.util.source_hash(source)
+            + marshal.dumps(code)
+        )
+        zinfo = zipfile.ZipInfo(importlib.util.cache_from_source(source_info.filename), date_time=ZIP_DATE_TIME)
+        zinfo.external_attr = source_info.external_attr
+        return zinfo, data
+    
+    def _build_tag(self) -> str:
+        """Identify build options that change the package contents"""
+        return sys.implementation.cache_tag if self.precompile else ''
+    
+    def _measure_upload_bandwidth(self) -> float:
+        """Time a small PUT to the staging bucket and return the upload rate in bytes/s"""
+        bucket = self._get_staging_bucket()
+        key = 'probe/bandwidth'
+        
+        start = time.perf_counter()
+        self.s3_client.put_object(Bucket=bucket, Key=key, Body=os.urandom(BANDWIDTH_PROBE_BYTES))
+        elapsed = time.perf_counter() - start
+        self.s3_client.delete_object(Bucket=bucket, Key=key)
         
-        return zip_filename
+        return BANDWIDTH_PROBE_BYTES / max(elapsed, 1e-6)
+    
+    def _resolve_compression(self) -> str:
+        """
+        Pick the compression mode that minimizes compress + upload time
+        
+        Fast links gain nothing from compression, so store; slow links are
+        worth the extra CPU of maximum DEFLATE; otherwise use DEFLATE level 1.
+        """
+        if self.compression != 'auto':
+            return self.compression
+        
+        bandwidth = self._measure_upload_bandwidth()
+        if bandwidth > FAST_UPLOAD_BYTES_PER_SEC:
+            mode = 'store'
+        elif bandwidth < SLOW_UPLOAD_BYTES_PER_SEC:
+            mode = 'max'
+        else:
+            mode = 'deflate'
+        
+        print(f"📶 Upload bandwidth ~{bandwidth / (1024 * 1024):.1f} MB/s, using '{mode}' compression")
+        return mode
+    
+    def _write_package(self, fileobj, package_files: List[Tuple[str, str]], compression: str) -> None:
+        """Write the deployment zip for package_files into fileobj"""
+        compress_type, compresslevel = COMPRESSION_MODES[compression]
+        
+        # Read files in parallel; the archive itself must be written serially
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            entries = list(executor.map(self._read_package_file, package_files))
+            if self.precompile:
+                sources = [entry for entry in entries if entry[0].filename.endswith('.py')]
+                entries += executor.map(self._compile_package_file, sources)
+        
+        with zipfile.ZipFile(fileobj, 'w', compress_type, compresslevel=compresslevel) as zipf:
+            for zinfo, data in entries:
+                zipf.writestr(zinfo, data, compress_type=compress_type, compresslevel=compresslevel)
     
     def create_iam_role(self) -> str:
         """Create IAM role for Lambda function"""
         print("🔐 Creating IAM role...")
         
-        trust_policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": {
-                        "Service": "lambda.amazonaws.com"
-                    },
-                    "Action": "sts:AssumeRole"
-                }
-            ]
-        }
-        
         try:
             # Try to get existing role
             response = self.iam_client.get_role(RoleName=self.role_name)
@@ -88,7 +358,7 @@ class AWSDeployer:
             # Create new role
             response = self.iam_client.create_role(
                 RoleName=self.role_name,
-                AssumeRolePolicyDocument=json.dumps(trust_policy),
+                AssumeRolePolicyDocument=TRUST_POLICY_JSON,
                 Description='IAM role for License Scanner Lambda function'
             )
             
@@ -101,85 +371,143 @@ class AWSDeployer:
             )
             
             # Attach Textract policy
-            textract_policy = {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Action": [
-                            "textract:DetectDocumentText"
-                        ],
-                        "Resource": "*"
-                    }
-                ]
-            }
-            
             self.iam_client.put_role_policy(
                 RoleName=self.role_name,
                 PolicyName='TextractAccess',
-                PolicyDocument=json.dumps(textract_policy)
+                PolicyDocument=TEXTRACT_POLICY_JSON
             )
             
             print(f"✅ Created IAM role: {role_arn}")
             
-            # Wait for role to be available
-            print("⏳ Waiting for IAM role to be available...")
-            time.sleep(5)
-            
             return role_arn
     
-    def create_lambda_function(self, zip_filename: str, role_arn: str) -> str:
-        """Create or update Lambda function"""
+    def _create_function_with_retry(self, **kwargs) -> Dict[str, Any]:
+        """
+        Create the Lambda function, retrying while a new IAM role propagates
+        
+        Lambda rejects roles that are not yet assumable with
+        InvalidParameterValueException, so back off instead of sleeping up front.
+        """
+        for delay in ROLE_PROPAGATION_DELAYS:
+            try:
+                return self.lambda_client.create_function(**kwargs)
+            except self.lambda_client.exceptions.InvalidParameterValueException as e:
+                if 'cannot be assumed' not in str(e):
+                    raise
+                print(f"⏳ Waiting {delay}s for IAM role to propagate...")
+                time.sleep(delay)
+        
+        return self.lambda_client.create_function(**kwargs)
+    
+    def _get_staging_bucket(self) -> str:
+        """Return the S3 bucket used to stage deployment artifacts, creating it if needed"""
+        if self.staging_bucket:
+            return self.staging_bucket
+        
+        account_id = self.session.client('sts').get_caller_identity()['Account']
+        bucket = f"license-scanner-artifacts-{account_id}-{self.region}"
+        
+        try:
+            self.s3_client.head_bucket(Bucket=bucket)
+        except self.s3_client.exceptions.ClientError:
+            print(f"🪣 Creating staging bucket: {bucket}")
+            if self.region == 'us-east-1':
+                self.s3_client.create_bucket(Bucket=bucket)
+            else:
+                self.s3_client.create_bucket(
+                    Bucket=bucket,
+                    CreateBucketConfiguration={'LocationConstraint': self.region}
+                )
+        
+        self.staging_bucket = bucket
+        return bucket
+    
+    def stage_deployment_package(self) -> Dict[str, str]:
+        """
+        Make sure the deployment package is staged in S3 and return its code location
+        
+        The object key is the source manifest hash, so the package is only built
+        and uploaded when a source file changed.
+        """
+        bucket = self._get_staging_bucket()
+        package_files = self._collect_package_files()
+        package_hash = self._package_manifest_hash(package_files, self._build_tag())
+        key = f"functions/{self.function_name}/{package_hash}.zip"
+        
+        try:
+            self.s3_client.head_object(Bucket=bucket, Key=key)
+            print(f"♻️ Reusing staged package: s3://{bucket}/{key}")
+            return {'S3Bucket': bucket, 'S3Key': key}
+        except self.s3_client.exceptions.ClientError:
+            pass  # Not staged yet
+        
+        # Zip straight into the multipart upload, no local temp file
+        compression = self._resolve_compression()
+        print("📦 Streaming deployment package to S3...")
+        with S3MultipartWriter(self.s3_client, bucket, key) as writer:
+            self._write_package(writer, package_files, compression)
+        
+        print(f"✅ Staged s3://{bucket}/{key}")
+        return {'S3Bucket': bucket, 'S3Key': key}
+    
+    def _function_configuration(self) -> Dict[str, Any]:
+        """Desired runtime configuration shared by create and update"""
+        return {
+            'Runtime': LAMBDA_RUNTIME,
+            'Handler': 'lambda_handler.lambda_handler',
+            'Timeout': 30,
+            'MemorySize': 512,
+            'Environment': {
+                'Variables': {
+                    'SCANNER_REGION': self.region,
+                    # /var/task is read-only; don't attempt to write bytecode caches
+                    'PYTHONDONTWRITEBYTECODE': '1'
+                }
+            }
+        }
+    
+    def create_lambda_function(self, code_location: Dict[str, str], role_arn: str) -> str:
+        """Create or update Lambda function from a staged S3 package"""
         print("🚀 Creating/updating Lambda function...")
         
-        with open(zip_filename, 'rb') as zip_file:
-            zip_content = zip_file.read()
+        desired_config = self._function_configuration()
         
         try:
             # Try to update existing function
             response = self.lambda_client.update_function_code(
                 FunctionName=self.function_name,
-                ZipFile=zip_content
+                **code_location
             )
             
             # Wait for update to complete
             print("⏳ Waiting for function update to complete...")
-            waiter = self.lambda_client.get_waiter('function_updated')
-            waiter.wait(FunctionName=self.function_name)
-            
-            # Update configuration
-            self.lambda_client.update_function_configuration(
-                FunctionName=self.function_name,
-                Runtime='python3.9',
-                Handler='lambda_handler.lambda_handler',
-                Timeout=30,
-                MemorySize=512,
-                Environment={
-                    'Variables': {
-                        'SCANNER_REGION': self.region
-                    }
-                }
-            )
+            waiter = self.lambda_client.get_waiter('function_updated_v2')
+            waiter.wait(FunctionName=self.function_name, WaiterConfig=FUNCTION_WAITER_CONFIG)
+            
+            # Update configuration only if it drifted; update_function_code
+            # already returns the current configuration
+            current_config = {key: response.get(key) for key in desired_config}
+            current_config['Environment'] = {
+                'Variables': response.get('Environment', {}).get('Variables', {})
+            }
+            if current_config != desired_config:
+                self.lambda_client.update_function_configuration(
+                    FunctionName=self.function_name,
+                    **desired_config
+                )
+                waiter.wait(FunctionName=self.function_name, WaiterConfig=FUNCTION_WAITER_CONFIG)
             
             function_arn = response['FunctionArn']
             print(f"✅ Updated Lambda function: {function_arn}")
             
         except self.lambda_client.exceptions.ResourceNotFoundException:
             # Create new function
-            response = self.lambda_client.create_function(
+            response = self._create_function_with_retry(
                 FunctionName=self.function_name,
-                Runtime='python3.9',
                 Role=role_arn,
-                Handler='lambda_handler.lambda_handler',
-                Code={'ZipFile': zip_content},
+                Code=code_location,
                 Description='US Driver\'s License Scanner API',
-                Timeout=30,
-                MemorySize=512,
-                Environment={
-                    'Variables': {
-                        'SCANNER_REGION': self.region
-                    }
-                }
+                **desired_config
             )
             
             function_arn = response['FunctionArn']
@@ -187,6 +515,45 @@ class AWSDeployer:
         
         return function_arn
     
+    def _setup_proxy_integration(self, api_id: str, resource_id: str, lambda_uri: str) -> None:
+        """Create the ANY method and Lambda proxy integration on the proxy resource"""
+        # Create ANY method for proxy resource
+        try:
+            self.apigateway_client.put_method(
+                restApiId=api_id,
+                resourceId=resource_id,
+                httpMethod='ANY',
+                authorizationType='NONE'
+            )
+        except self.apigateway_client.exceptions.ConflictException:
+            pass  # Method already exists
+        
+        # Create integration (requires the method to exist)
+        try:
+            self.apigateway_client.put_integration(
+                restApiId=api_id,
+                resourceId=resource_id,
+                httpMethod='ANY',
+                type='AWS_PROXY',
+                integrationHttpMethod='POST',
+                uri=lambda_uri
+            )
+        except self.apigateway_client.exceptions.ConflictException:
+            pass  # Integration already exists
+    
+    def _add_api_gateway_permission(self, source_arn: str) -> None:
+        """Allow API Gateway to invoke the Lambda function"""
+        try:
+            self.lambda_client.add_permission(
+                FunctionName=self.function_name,
+                StatementId='api-gateway-invoke',
+                Action='lambda:InvokeFunction',
+                Principal='apigateway.amazonaws.com',
+                SourceArn=source_arn
+            )
+        except self.lambda_client.exceptions.ResourceConflictException:
+            pass  # Permission already exists
+    
     def create_api_gateway(self, function_arn: str) -> str:
         """Create API Gateway and connect to Lambda"""
         print("🌐 Creating API Gateway...")
@@ -218,68 +585,33 @@ class AWSDeployer:
                 api_id = response['id']
                 print(f"✅ Created API Gateway: {api_id}")
             
-            # Get root resource
+            # Index existing resources by path once
             resources = self.apigateway_client.get_resources(restApiId=api_id)
-            root_resource_id = None
+            resources_by_path = {resource['path']: resource for resource in resources['items']}
+            root_resource_id = resources_by_path['/']['id']
             
-            for resource in resources['items']:
-                if resource['path'] == '/':
-                    root_resource_id = resource['id']
-                    break
-            
-            # Create proxy resource for all paths
-            try:
+            # Create proxy resource for all paths unless it already exists
+            proxy_resource = resources_by_path.get('/{proxy+}')
+            if proxy_resource is None:
                 proxy_resource = self.apigateway_client.create_resource(
                     restApiId=api_id,
                     parentId=root_resource_id,
                     pathPart='{proxy+}'
                 )
-                proxy_resource_id = proxy_resource['id']
-            except self.apigateway_client.exceptions.ConflictException:
-                # Resource already exists
-                for resource in resources['items']:
-                    if resource.get('pathPart') == '{proxy+}':
-                        proxy_resource_id = resource['id']
-                        break
+            proxy_resource_id = proxy_resource['id']
             
-            # Create ANY method for proxy resource
-            try:
-                self.apigateway_client.put_method(
-                    restApiId=api_id,
-                    resourceId=proxy_resource_id,
-                    httpMethod='ANY',
-                    authorizationType='NONE'
-                )
-            except self.apigateway_client.exceptions.ConflictException:
-                pass  # Method already exists
-            
-            # Create integration
             lambda_uri = f"arn:aws:apigateway:{self.region}:lambda:path/2015-03-31/functions/{function_arn}/invocations"
-            
-            try:
-                self.apigateway_client.put_integration(
-                    restApiId=api_id,
-                    resourceId=proxy_resource_id,
-                    httpMethod='ANY',
-                    type='AWS_PROXY',
-                    integrationHttpMethod='POST',
-                    uri=lambda_uri
-                )
-            except self.apigateway_client.exceptions.ConflictException:
-                pass  # Integration already exists
-            
-            # Add Lambda permission for API Gateway
-            try:
-                source_arn = f"arn:aws:execute-api:{self.region}:{account_id}:{api_id}/*/*"
-                self.lambda_client.add_permission(
-                    FunctionName=self.function_name,
-                    StatementId='api-gateway-invoke',
-                    Action='lambda:InvokeFunction',
-                    Principal='apigateway.amazonaws.com',
-                    SourceArn=source_arn
-                )
-            except self.lambda_client.exceptions.ResourceConflictException:
-                pass  # Permission already exists
+            source_arn = f"arn:aws:execute-api:{self.region}:{account_id}:{api_id}/*/*"
+            
+            # The method/integration pair and the Lambda permission are independent,
+            # so issue them concurrently (boto3 clients are thread-safe)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    executor.submit(self._setup_proxy_integration, api_id, proxy_resource_id, lambda_uri),
+                    executor.submit(self._add_api_gateway_permission, source_arn)
+                ]
+                for future in futures:
+                    future.result()
             
             # Deploy API
             deployment = self.apigateway_client.create_deployment(
@@ -304,21 +636,18 @@ class AWSDeployer:
         print("=" * 50)
         
         try:
-            # Step 1: Create deployment package
-            zip_filename = self.create_deployment_package()
+            # Step 1: Create and stage deployment package (skipped if unchanged)
+            code_location = self.stage_deployment_package()
             
             # Step 2: Create IAM role
             role_arn = self.create_iam_role()
             
             # Step 3: Create Lambda function
-            function_arn = self.create_lambda_function(zip_filename, role_arn)
+            function_arn = self.create_lambda_function(code_location, role_arn)
             
             # Step 4: Create API Gateway
             api_url = self.create_api_gateway(function_arn)
             
-            # Clean up
-            os.remove(zip_filename)
-            
             print("\n" + "=" * 50)
             print("🎉 Deployment completed successfully!")
             print(f"📱 API URL: {api_url}")
@@ -342,10 +671,14 @@ def main():
     
     parser = argparse.ArgumentParser(description='Deploy License Scanner to AWS')
     parser.add_argument('--region', default='us-east-1', help='AWS region')
+    parser.add_argument('--compression', default='deflate',
+                        choices=['auto', *COMPRESSION_MODES],
+                        help='Zip compression: store, deflate (level 1), max (level 9), '
+                             'or auto to pick from measured upload bandwidth (default: deflate)')
     
     args = parser.parse_args()
     
-    deployer = AWSDeployer(region=args.region)
+    deployer = AWSDeployer(region=args.region, compression=args.compression)
     result = deployer.deploy()
     
     print("\n📋 Deployment Summary:")
@@ -5,11 +5,66 @@ AWS Lambda Deployment Script for Driver's License Scanner
 This script helps deploy the scanner agent to AWS Lambda.
 """
 
+import hashlib
 import json
 import zipfile
 import boto3
 import os
+import sys
+import time
 from pathlib import Path
+from botocore.config import Config
+
+# Add the repository root to Python path for the shared deployment helpers
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from deploy_aws import S3MultipartWriter
+
+# IAM policy documents, serialized once
+TRUST_POLICY_JSON = json.dumps({
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Principal": {
+                "Service": "lambda.amazonaws.com"
+            },
+            "Action": "sts:AssumeRole"
+        }
+    ]
+})
+
+# Execution policy with Textract permissions
+EXECUTION_POLICY_JSON = json.dumps({
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Action": [
+                "logs:CreateLogGroup",
+                "logs:CreateLogStream",
+                "logs:PutLogEvents"
+            ],
+            "Resource": "arn:aws:logs:*:*:*"
+        },
+        {
+            "Effect": "Allow",
+            "Action": [
+                "textract:DetectDocumentText"
+            ],
+            "Resource": "*"
+        }
+    ]
+})
+
+# Backoff schedule (seconds) while waiting for a new IAM role to become assumable
+ROLE_PROPAGATION_DELAYS = (0.5, 1, 2, 4, 8)
+
+# Files packaged into the Lambda deployment zip
+FILES_TO_INCLUDE = [
+    'drivers_license_scanner.py',
+    'requirements.txt'
+]
 
 class LambdaDeployer:
     """Helper class for deploying to AWS Lambda"""
@@ -17,30 +72,28 @@ class LambdaDeployer:
     def __init__(self, function_name="drivers-license-scanner"):
         """Initialize the deployer"""
         self.function_name = function_name
-        self.lambda_client = boto3.client('lambda')
-        self.iam_client = boto3.client('iam')
-    
-    def create_deployment_package(self):
-        """Create deployment ZIP package"""
-        print("📦 Creating deployment package...")
-        
-        files_to_include = [
-            'drivers_license_scanner.py',
-            'requirements.txt'
-        ]
         
-        zip_path = f"{self.function_name}.zip"
-        
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_name in files_to_include:
+        # Share one session (credentials, endpoints) and connection pool across clients
+        self.session = boto3.Session()
+        client_config = Config(
+            max_pool_connections=50,
+            retries={'max_attempts': 10, 'mode': 'adaptive'}
+        )
+        self.lambda_client = self.session.client('lambda', config=client_config)
+        self.iam_client = self.session.client('iam', config=client_config)
+        self.s3_client = self.session.client('s3', config=client_config)
+        self.staging_bucket = os.environ.get('LICENSE_SCANNER_STAGING_BUCKET')
+    
+    def _write_package(self, fileobj):
+        """Write the deployment zip into fileobj"""
+        # Level 1 DEFLATE: nearly the size of the default level at a fraction of the CPU
+        with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+            for file_name in FILES_TO_INCLUDE:
                 if Path(file_name).exists():
                     zipf.write(file_name)
                     print(f"  ✅ Added {file_name}")
                 else:
                     print(f"  ⚠️ Warning: {file_name} not found")
-        
-        print(f"📦 Package created: {zip_path}")
-        return zip_path
     
     def create_iam_role(self):
         """Create IAM role for Lambda function"""
@@ -48,48 +101,11 @@ class LambdaDeployer:
         
         role_name = f"{self.function_name}-role"
         
-        # Trust policy for Lambda
-        trust_policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": {
-                        "Service": "lambda.amazonaws.com"
-                    },
-                    "Action": "sts:AssumeRole"
-                }
-            ]
-        }
-        
-        # Execution policy with Textract permissions
-        execution_policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Action": [
-                        "logs:CreateLogGroup",
-                        "logs:CreateLogStream",
-                        "logs:PutLogEvents"
-                    ],
-                    "Resource": "arn:aws:logs:*:*:*"
-                },
-                {
-                    "Effect": "Allow",
-                    "Action": [
-                        "textract:DetectDocumentText"
-                    ],
-                    "Resource": "*"
-                }
-            ]
-        }
-        
         try:
             # Create role
             role_response = self.iam_client.create_role(
                 RoleName=role_name,
-                AssumeRolePolicyDocument=json.dumps(trust_policy),
+                AssumeRolePolicyDocument=TRUST_POLICY_JSON,
                 Description=f"IAM role for {self.function_name} Lambda function"
             )
             
@@ -97,7 +113,7 @@ class LambdaDeployer:
             self.iam_client.put_role_policy(
                 RoleName=role_name,
                 PolicyName=f"{role_name}-policy",
-                PolicyDocument=json.dumps(execution_policy)
+                PolicyDocument=EXECUTION_POLICY_JSON
             )
             
             role_arn = role_response['Role']['Arn']
@@ -111,21 +127,93 @@ class LambdaDeployer:
             print(f"  ℹ️ Using existing role: {role_arn}")
             return role_arn
     
-    def create_lambda_function(self, zip_path, role_arn):
-        """Create or update Lambda function"""
-        print("🚀 Creating Lambda function...")
+    def _create_function_with_retry(self, **kwargs):
+        """
+        Create the Lambda function, retrying while a new IAM role propagates
+        
+        Lambda rejects roles that are not yet assumable with
+        InvalidParameterValueException, so back off instead of sleeping up front.
+        """
+        for delay in ROLE_PROPAGATION_DELAYS:
+            try:
+                return self.lambda_client.create_function(**kwargs)
+            except self.lambda_client.exceptions.InvalidParameterValueException as e:
+                if 'cannot be assumed' not in str(e):
+                    raise
+                print(f"  ⏳ Waiting {delay}s for IAM role to propagate...")
+                time.sleep(delay)
         
-        with open(zip_path, 'rb') as zip_file:
-            zip_content = zip_file.read()
+        return self.lambda_client.create_function(**kwargs)
+    
+    def _get_staging_bucket(self):
+        """Return the S3 bucket used to stage deployment artifacts, creating it if needed"""
+        if self.staging_bucket:
+            return self.staging_bucket
+        
+        region = self.session.region_name or 'us-east-1'
+        account_id = self.session.client('sts').get_caller_identity()['Account']
+        bucket = f"license-scanner-artifacts-{account_id}-{region}"
+        
+        try:
+            self.s3_client.head_bucket(Bucket=bucket)
+        except self.s3_client.exceptions.ClientError:
+            print(f"  🪣 Creating staging bucket: {bucket}")
+            if region == 'us-east-1':
+                self.s3_client.create_bucket(Bucket=bucket)
+            else:
+                self.s3_client.create_bucket(
+                    Bucket=bucket,
+                    CreateBucketConfiguration={'LocationConstraint': region}
+                )
+        
+        self.staging_bucket = bucket
+        return bucket
+    
+    def _package_manifest_hash(self):
+        """Hash the (name, mtime, size) manifest of the package sources"""
+        manifest = hashlib.blake2b()
+        for file_name in FILES_TO_INCLUDE:
+            if Path(file_name).exists():
+                stat = os.stat(file_name)
+                manifest.update(f"{file_name}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+        return manifest.hexdigest()
+    
+    def stage_deployment_package(self):
+        """
+        Make sure the deployment package is staged in S3 and return its code location
+        
+        The object key is the source manifest hash, so the package is only built
+        and uploaded when a source file changed.
+        """
+        bucket = self._get_staging_bucket()
+        key = f"functions/{self.function_name}/{self._package_manifest_hash()}.zip"
+        
+        try:
+            self.s3_client.head_object(Bucket=bucket, Key=key)
+            print(f"♻️ Reusing staged package: s3://{bucket}/{key}")
+            return {'S3Bucket': bucket, 'S3Key': key}
+        except self.s3_client.exceptions.ClientError:
+            pass  # Not staged yet
+        
+        # Zip straight into the multipart upload, no local temp file
+        print("📦 Streaming deployment package to S3...")
+        with S3MultipartWriter(self.s3_client, bucket, key) as writer:
+            self._write_package(writer)
+        
+        return {'S3Bucket': bucket, 'S3Key': key}
+    
+    def create_lambda_function(self, code_location, role_arn):
+        """Create or update Lambda function from a staged S3 package"""
+        print("🚀 Creating Lambda function...")
         
         try:
             # Try to create new function
-            response = self.lambda_client.create_function(
+            response = self._create_function_with_retry(
                 FunctionName=self.function_name,
                 Runtime='python3.9',
                 Role=role_arn,
                 Handler='drivers_license_scanner.lambda_handler',
-                Code={'ZipFile': zip_content},
+                Code=code_location,
                 Description='US Driver\'s License Scanner Agent',
                 Timeout=30,
                 MemorySize=512,
@@ -145,7 +233,7 @@ class LambdaDeployer:
             
             response = self.lambda_client.update_function_code(
                 FunctionName=self.function_name,
-                ZipFile=zip_content
+                **code_location
             )
             
             print(f"  ✅ Updated function: {response['FunctionArn']}")
@@ -177,28 +265,24 @@ class LambdaDeployer:
         except Exception as e:
             print(f"  ❌ Function test failed: {e}")
     
-    def deploy(self):
+    def deploy(self, smoke_test=False):
         """Full deployment process"""
         print(f"🚀 Deploying {self.function_name} to AWS Lambda")
         print("=" * 50)
         
         try:
-            # Step 1: Create deployment package
-            zip_path = self.create_deployment_package()
+            # Step 1: Create and stage deployment package (skipped if unchanged)
+            code_location = self.stage_deployment_package()
             
             # Step 2: Create IAM role
             role_arn = self.create_iam_role()
             
-            # Wait a moment for role to propagate
-            import time
-            print("⏳ Waiting for IAM role to propagate...")
-            time.sleep(10)
-            
             # Step 3: Create/update Lambda function
-            function_arn = self.create_lambda_function(zip_path, role_arn)
+            function_arn = self.create_lambda_function(code_location, role_arn)
             
-            # Step 4: Test function
-            self.test_function()
+            # Step 4: Test function (opt-in, it forces a cold start)
+            if smoke_test:
+                self.test_function()
             
             print("\n" + "=" * 50)
             print("🎉 Deployment completed successfully!")
@@ -210,10 +294,6 @@ class LambdaDeployer:
             print("  2. Set up API Gateway (optional)")
             print("  3. Configure monitoring and alerts")
             
-            # Clean up
-            os.remove(zip_path)
-            print(f"🧹 Cleaned up {zip_path}")
-            
         except Exception as e:
             print(f"\n❌ Deployment failed: {e}")
             print("Please check your AWS credentials and permissions.")
@@ -225,6 +305,8 @@ def main():
     parser = argparse.ArgumentParser(description='Deploy Driver\'s License Scanner to AWS Lambda')
     parser.add_argument('--function-name', default='drivers-license-scanner',
                        help='Lambda function name (default: drivers-license-scanner)')
+    parser.add_argument('--smoke-test', action='store_true',
+                       help='Invoke the function once after deploying')
     
     args = parser.parse_args()
     
@@ -239,7 +321,7 @@ def main():
     
     # Deploy
     deployer = LambdaDeployer(args.function_name)
-    deployer.deploy()
+    deployer.deploy(smoke_test=args.smoke_test)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
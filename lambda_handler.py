@@ -4,19 +4,119 @@ AWS Lambda handler for the Driver's License Scanner web service
 """
 
 import json
-import base64
 import os
-import sys
-from typing import Dict, Any
+from typing import Dict, Any, Union
 
-# Add the current directory to Python path
-sys.path.insert(0, os.path.dirname(__file__))
+from botocore.exceptions import BotoCoreError, ClientError
 
 from lambda_api import LicenseScannerAPI
+from license_scanner.encoding import b64decode
+from license_scanner.multipart import extract_form_file
+from license_scanner.scanner import get_scanner
+from license_scanner.serialization import json_dumps, json_loads
 
-# Initialize API with region from environment variable
+# Initialize API around the process-wide scanner, with region from environment variable
 region = os.environ.get('SCANNER_REGION', os.environ.get('AWS_REGION', 'us-east-1'))
-api = LicenseScannerAPI(region_name=region)
+api = LicenseScannerAPI(validator='magic', scanner=get_scanner(region))
+
+def _prewarm() -> None:
+    """
+    Do first-request work during Lambda init instead of inside the billed handler
+    
+    boto3 loads the Textract service model and opens its HTTPS connection on the
+    first API call, so issue a call that Textract rejects immediately. The
+    scanner's regex patterns need no warming: they are compiled when the
+    scanner module is imported.
+    """
+    if api.scanner.textract is None:
+        return
+    
+    try:
+        api.scanner.textract.detect_document_text(Document={'Bytes': b'x'})
+    except (BotoCoreError, ClientError):
+        pass  # Expected: the document is invalid, but the client is now warm
+
+# Only pay for the warm-up call when actually running inside Lambda
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    _prewarm()
+
+# Static response bodies, serialized once per container instead of per request
+HEALTH_BODY = json_dumps({
+    'status': 'healthy',
+    'service': 'Driver\'s License Scanner',
+    'version': '1.0.0',
+    'deployment': 'AWS Lambda'
+})
+
+SUPPORTED_STATES = api.get_supported_states()
+STATES_BODY = json_dumps({
+    'states': SUPPORTED_STATES,
+    'count': len(SUPPORTED_STATES)
+})
+
+API_DOCS = {
+    'service': 'US Driver\'s License Scanner API',
+    'version': '1.0.0',
+    'deployment': 'AWS Lambda',
+    'endpoints': {
+        'GET /health': 'Health check',
+        'GET /states': 'Get supported US states',
+        'POST /scan/base64': 'Scan license from base64 image data',
+        'POST /scan': 'Scan license from multipart file upload'
+    },
+    'usage': {
+        'base64_example': {
+            'method': 'POST',
+            'url': '/scan/base64',
+            'headers': {'Content-Type': 'application/json'},
+            'body': {'image_data': 'base64_encoded_image_string'}
+        }
+    },
+    'extracted_fields': [
+        'license_number',
+        'state', 
+        'first_name',
+        'last_name',
+        'date_of_birth',
+        'confidence_score'
+    ]
+}
+
+ROOT_BODY = json_dumps(API_DOCS, indent=True)
+
+# CORS headers
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
+    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+# Headers for errors raised before routing
+ERROR_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
+def _response(status_code: int, body: Union[str, Dict[str, Any]], headers: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Build an API Gateway proxy response
+    
+    Args:
+        status_code: HTTP status code
+        body: Pre-serialized JSON string, or an object to serialize
+        headers: Response headers
+        
+    Returns:
+        Lambda proxy integration response
+    """
+    if not isinstance(body, str):
+        body = json_dumps(body)
+    return {
+        'statusCode': status_code,
+        'headers': headers,
+        'body': body
+    }
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -34,132 +134,83 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         http_method = event.get('httpMethod', 'GET')
         path = event.get('path', '/')
         
-        # CORS headers
-        cors_headers = {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
-            'Content-Type': 'application/json'
-        }
-        
         # Handle preflight OPTIONS requests
         if http_method == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': cors_headers,
-                'body': json.dumps({'message': 'CORS preflight'})
-            }
+            return _response(200, {'message': 'CORS preflight'}, CORS_HEADERS)
         
         # Route requests
-        if path == '/health' and http_method == 'GET':
-            return handle_health(cors_headers)
-        
-        elif path == '/states' and http_method == 'GET':
-            return handle_states(cors_headers)
-        
-        elif path == '/scan' and http_method == 'POST':
-            return handle_scan_multipart(event, cors_headers)
-        
-        elif path == '/scan/base64' and http_method == 'POST':
-            return handle_scan_base64(event, cors_headers)
-        
-        elif path == '/' and http_method == 'GET':
-            return handle_root(cors_headers)
+        handler = ROUTES.get((http_method, path))
+        if handler is None:
+            return _response(404, {
+                'success': False,
+                'error': f'Endpoint not found: {http_method} {path}'
+            }, CORS_HEADERS)
         
-        else:
-            return {
-                'statusCode': 404,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'success': False,
-                    'error': f'Endpoint not found: {http_method} {path}'
-                })
-            }
+        return handler(event, CORS_HEADERS)
             
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'success': False,
-                'error': f'Internal server error: {str(e)}'
-            })
-        }
+        return _response(500, {
+            'success': False,
+            'error': f'Internal server error: {str(e)}'
+        }, ERROR_HEADERS)
 
-def handle_health(headers: Dict[str, str]) -> Dict[str, Any]:
+def handle_health(event: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
     """Handle health check endpoint"""
-    return {
-        'statusCode': 200,
-        'headers': headers,
-        'body': json.dumps({
-            'status': 'healthy',
-            'service': 'Driver\'s License Scanner',
-            'version': '1.0.0',
-            'deployment': 'AWS Lambda'
-        })
-    }
+    return _response(200, HEALTH_BODY, headers)
 
-def handle_states(headers: Dict[str, str]) -> Dict[str, Any]:
+def handle_states(event: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
     """Handle states endpoint"""
-    return {
-        'statusCode': 200,
-        'headers': headers,
-        'body': json.dumps({
-            'states': api.get_supported_states(),
-            'count': len(api.get_supported_states())
-        })
-    }
+    return _response(200, STATES_BODY, headers)
+
+def _request_body(event: Dict[str, Any]) -> Union[bytes, str]:
+    """
+    Return the raw request body, base64-decoded when API Gateway encoded it
+    
+    Decoded bodies stay as bytes; the JSON parser and multipart parser both
+    accept them directly, so there is no intermediate utf-8 str copy.
+    """
+    body = event.get('body') or ''
+    if event.get('isBase64Encoded', False):
+        return b64decode(body, validate=True)
+    return body
 
 def handle_scan_base64(event: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
     """Handle base64 image scanning"""
     try:
-        # Parse request body
-        body = event.get('body', '{}')
-        if event.get('isBase64Encoded', False):
-            body = base64.b64decode(body).decode('utf-8')
+        # Decode the request body; binascii.Error from a malformed base64
+        # body is a ValueError, and a client error rather than a server one
+        try:
+            body = _request_body(event)
+        except ValueError:
+            return _response(400, {
+                'success': False,
+                'error': 'Invalid base64 request body'
+            }, headers)
         
-        data = json.loads(body)
+        # Parse request body
+        data = json_loads(body or '{}')
         
         if 'image_data' not in data:
-            return {
-                'statusCode': 400,
-                'headers': headers,
-                'body': json.dumps({
-                    'success': False,
-                    'error': 'Missing image_data in request body'
-                })
-            }
+            return _response(400, {
+                'success': False,
+                'error': 'Missing image_data in request body'
+            }, headers)
         
         # Scan the license
         result = api.scan_from_base64(data['image_data'])
         
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': json.dumps(result)
-        }
+        return _response(200, result, headers)
         
     except json.JSONDecodeError:
-        return {
-            'statusCode': 400,
-            'headers': headers,
-            'body': json.dumps({
-                'success': False,
-                'error': 'Invalid JSON in request body'
-            })
-        }
+        return _response(400, {
+            'success': False,
+            'error': 'Invalid JSON in request body'
+        }, headers)
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': headers,
-            'body': json.dumps({
-                'success': False,
-                'error': str(e)
-            })
-        }
+        return _response(500, {
+            'success': False,
+            'error': str(e)
+        }, headers)
 
 def handle_scan_multipart(event: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
     """Handle multipart file upload scanning"""
@@ -167,93 +218,61 @@ def handle_scan_multipart(event: Dict[str, Any], headers: Dict[str, str]) -> Dic
         # For Lambda, multipart data comes as base64 encoded body
         body = event.get('body', '')
         if not body:
-            return {
-                'statusCode': 400,
-                'headers': headers,
-                'body': json.dumps({
-                    'success': False,
-                    'error': 'No file data provided'
-                })
-            }
+            return _response(400, {
+                'success': False,
+                'error': 'No file data provided'
+            }, headers)
         
         # If the body is base64 encoded, decode it
         if event.get('isBase64Encoded', False):
             try:
                 # Decode the base64 body
-                decoded_body = base64.b64decode(body)
+                decoded_body = _request_body(event)
+                
+                # Extract the image part from the multipart envelope
+                request_headers = event.get('headers') or {}
+                content_type = request_headers.get('Content-Type') or request_headers.get('content-type', '')
+                if content_type.startswith('multipart/form-data'):
+                    image_bytes = extract_form_file(decoded_body, content_type, 'image')
+                    if image_bytes is None:
+                        return _response(400, {
+                            'success': False,
+                            'error': 'No image file provided'
+                        }, headers)
+                else:
+                    # Raw image upload without a form envelope
+                    image_bytes = decoded_body
                 
-                # Extract image data from multipart (simplified approach)
-                # In a real implementation, you'd parse the multipart boundary
-                # For now, assume the decoded body is the image data
-                result = api.scan_from_bytes(decoded_body)
+                result = api.scan_from_bytes(image_bytes)
                 
-                return {
-                    'statusCode': 200,
-                    'headers': headers,
-                    'body': json.dumps(result)
-                }
+                return _response(200, result, headers)
                 
             except Exception as e:
-                return {
-                    'statusCode': 400,
-                    'headers': headers,
-                    'body': json.dumps({
-                        'success': False,
-                        'error': f'Error processing image: {str(e)}'
-                    })
-                }
-        else:
-            return {
-                'statusCode': 400,
-                'headers': headers,
-                'body': json.dumps({
+                return _response(400, {
                     'success': False,
+                    'error': f'Error processing image: {str(e)}'
+                }, headers)
+        else:
+            return _response(400, {
+                'success': False,
                 'error': 'Please use base64 endpoint for file uploads in Lambda'
-                })
-            }
+            }, headers)
             
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': headers,
-            'body': json.dumps({
-                'success': False,
-                'error': str(e)
-            })
-        }
+        return _response(500, {
+            'success': False,
+            'error': str(e)
+        }, headers)
 
-def handle_root(headers: Dict[str, str]) -> Dict[str, Any]:
+def handle_root(event: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
     """Handle root endpoint with API documentation"""
-    api_docs = {
-        'service': 'US Driver\'s License Scanner API',
-        'version': '1.0.0',
-        'deployment': 'AWS Lambda',
-        'endpoints': {
-            'GET /health': 'Health check',
-            'GET /states': 'Get supported US states',
-            'POST /scan/base64': 'Scan license from base64 image data',
-            'POST /scan': 'Scan license from multipart file upload'
-        },
-        'usage': {
-            'base64_example': {
-                'method': 'POST',
-                'url': '/scan/base64',
-                'headers': {'Content-Type': 'application/json'},
-                'body': {'image_data': 'base64_encoded_image_string'}
-            }
-        },
-        'extracted_fields': [
-            'license_number',
-            'state', 
-            'first_name',
-            'last_name',
-            'date_of_birth',
-            'confidence_score'
-        ]
-    }
-    
-    return {
-        'statusCode': 200,
-        'headers': headers,
-        'body': json.dumps(api_docs, indent=2)
-    }
\ No newline at end of file
+    return _response(200, ROOT_BODY, headers)
+
+# (method, path) -> handler; every handler takes (event, headers)
+ROUTES = {
+    ('GET', '/health'): handle_health,
+    ('GET', '/states'): handle_states,
+    ('POST', '/scan'): handle_scan_multipart,
+    ('POST', '/scan/base64'): handle_scan_base64,
+    ('GET', '/'): handle_root,
+}
\ No newline at end of file
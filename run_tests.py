@@ -12,12 +12,15 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 def run_main_tests():
     """Run the main test suite"""
     print("🧪 Running main test suite...")
-    os.system(f"python3 {os.path.join('tests', 'test_scanner.py')}")
+    # Run in-process to avoid a second interpreter start and boto3 import
+    from tests import test_scanner
+    test_scanner.main()
 
 def run_ct_tests():
     """Run Connecticut-specific tests"""
     print("\n🧪 Running Connecticut-specific tests...")
-    os.system(f"python3 {os.path.join('tests', 'test_ct_extraction.py')}")
+    from tests import test_ct_extraction
+    test_ct_extraction.test_ct_extraction()
 
 def main():
     """Run all tests"""
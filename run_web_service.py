@@ -5,11 +5,27 @@ Entry point to run the Driver's License Scanner Web Service
 
 import sys
 import os
+import shutil
 
 # Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+sys.path.insert(0, SRC_DIR)
 
-from license_scanner.web_service import app
+HOST = '0.0.0.0'
+PORT = 8080
+
+def run_gunicorn(gunicorn_path):
+    """Replace this process with a multi-worker gunicorn server with keep-alive"""
+    os.execv(gunicorn_path, [
+        gunicorn_path,
+        '--workers', str(os.cpu_count() or 1),
+        '--worker-class', 'gthread',
+        '--threads', '4',
+        '--keep-alive', '30',
+        '--bind', f'{HOST}:{PORT}',
+        '--pythonpath', SRC_DIR,
+        'license_scanner.web_service:app'
+    ])
 
 if __name__ == '__main__':
     print("🚀 Starting Driver's License Scanner Web Service...")
@@ -20,4 +36,12 @@ if __name__ == '__main__':
     print("   GET /states - Get supported states")
     print("   GET /health - Health check")
     
-    app.run(debug=True, host='0.0.0.0', port=8080)
\ No newline at end of file
+    gunicorn_path = shutil.which('gunicorn')
+    if gunicorn_path and '--dev' not in sys.argv:
+        run_gunicorn(gunicorn_path)
+    
+    # Fallback: Flask's built-in server (use --dev to force it), never in debug mode
+    print("⚠️ gunicorn not found, using the Flask development server" if not gunicorn_path
+          else "🛠️ Using the Flask development server")
+    from license_scanner.web_service import app
+    app.run(debug=False, threaded=True, host=HOST, port=PORT)
\ No newline at end of file
@@ -23,7 +23,7 @@ def main():
     args = parser.parse_args()
     
     # Initialize API
-    api = LicenseScannerAPI(region_name=args.region)
+    api = LicenseScannerAPI(region_name=args.region, validator='pil')
     
     # Scan the license
     result = api.scan_from_file(args.image_path)
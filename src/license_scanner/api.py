@@ -7,42 +7,78 @@ Supports multiple input formats and provides enhanced error handling.
 """
 
 import json
-import base64
 import io
 from pathlib import Path
-from PIL import Image
+from typing import Optional
 from .scanner import DriversLicenseScanner
+from .encoding import b64decode
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Image validation strategies: 'magic' checks the file signature only (no PIL,
+# used on Lambda where Textract validates the image), 'pil' fully decodes it
+VALIDATORS = ('magic', 'pil')
+
+# Smallest payload accepted as an image, in raw bytes
+MIN_IMAGE_BYTES = 100
+
+# Leading bytes of supported image formats, checked in one C-level startswith call
+IMAGE_SIGNATURES = (
+    b'\xFF\xD8\xFF',  # JPEG
+    b'\x89\x50\x4E\x47',  # PNG
+    b'\x47\x49\x46\x38',  # GIF
+    b'\x42\x4D',  # BMP
+)
+
+def _has_image_signature(head: bytes) -> bool:
+    """Check the leading bytes of an image against the supported signatures"""
+    return head.startswith(IMAGE_SIGNATURES)
+
 class LicenseScannerAPI:
     """API wrapper for the driver's license scanner"""
     
-    def __init__(self, region_name='us-east-1'):
-        """Initialize the API with the scanner"""
-        self.scanner = DriversLicenseScanner(region_name=region_name)
+    def __init__(self, region_name='us-east-1', validator: str = 'magic',
+                 scanner: Optional[DriversLicenseScanner] = None):
+        """
+        Initialize the API with the scanner
+        
+        Args:
+            region_name: AWS region for Textract (ignored when scanner is given)
+            validator: Image validation strategy, 'magic' or 'pil'
+            scanner: Existing scanner to reuse, e.g. the process-wide get_scanner()
+        """
+        if validator not in VALIDATORS:
+            raise ValueError(f"Unknown validator: {validator} (expected one of {', '.join(VALIDATORS)})")
+        
+        self.scanner = scanner if scanner is not None else DriversLicenseScanner(region_name=region_name)
+        self.validator = validator
+        
+        # Only pay for the PIL import when full image validation is requested
+        self._pil_image = None
+        if validator == 'pil':
+            from PIL import Image
+            self._pil_image = Image
     
-    def _image_to_base64(self, image_path: str) -> str:
+    def _validate_image_bytes(self, image_bytes: bytes) -> bool:
         """
-        Convert image file to base64 string
+        Basic validation of raw image bytes
         
         Args:
-            image_path: Path to image file
+            image_bytes: Raw image bytes
             
         Returns:
-            Base64 encoded image string
+            True if the bytes look like a supported image, False otherwise
         """
-        try:
-            with open(image_path, 'rb') as image_file:
-                image_bytes = image_file.read()
-                return base64.b64encode(image_bytes).decode('utf-8')
-        except Exception as e:
-            raise Exception(f"Error reading image file: {e}")
+        # Basic size check (should be at least 100 bytes for a valid image)
+        if len(image_bytes) < MIN_IMAGE_BYTES:
+            return False
+        
+        return _has_image_signature(image_bytes)
     
     def _validate_image(self, image_data: bytes) -> bool:
         """
-        Validate that the image data is a valid image
+        Validate that the image data is a valid image using the configured validator
         
         Args:
             image_data: Raw image bytes
@@ -50,8 +86,11 @@ class LicenseScannerAPI:
         Returns:
             True if valid image, False otherwise
         """
+        if self._pil_image is None:
+            return self._validate_image_bytes(image_data)
+        
         try:
-            image = Image.open(io.BytesIO(image_data))
+            image = self._pil_image.open(io.BytesIO(image_data))
             image.verify()
             return True
         except Exception:
@@ -74,19 +113,11 @@ class LicenseScannerAPI:
                     'error': f'Image file not found: {image_path}'
                 }
             
-            # Convert to base64
-            image_base64 = self._image_to_base64(image_path)
-            
-            # Validate image
-            image_bytes = base64.b64decode(image_base64)
-            if not self._validate_image(image_bytes):
-                return {
-                    'success': False,
-                    'error': 'Invalid image format'
-                }
+            # Read raw bytes; Textract accepts them directly
+            with open(image_path, 'rb') as image_file:
+                image_bytes = image_file.read()
             
-            # Scan the license
-            return self.scanner.scan_license(image_base64)
+            return self.scan_from_bytes(image_bytes)
             
         except Exception as e:
             logger.error(f"Error scanning from file: {e}")
@@ -106,16 +137,17 @@ class LicenseScannerAPI:
             Dictionary with scan results
         """
         try:
-            # Validate base64 and image
-            image_bytes = base64.b64decode(image_base64)
-            if not self._validate_image(image_bytes):
+            # Decode once and scan the raw bytes. Not validating, like the
+            # scanner, so line-wrapped base64 (base64 CLI, encodebytes) is accepted
+            try:
+                image_bytes = b64decode(image_base64)
+            except Exception:
                 return {
                     'success': False,
                     'error': 'Invalid image format'
                 }
             
-            # Scan the license
-            return self.scanner.scan_license(image_base64)
+            return self.scan_from_bytes(image_bytes)
             
         except Exception as e:
             logger.error(f"Error scanning from base64: {e}")
@@ -142,11 +174,8 @@ class LicenseScannerAPI:
                     'error': 'Invalid image format'
                 }
             
-            # Convert to base64
-            image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-            
-            # Scan the license
-            return self.scanner.scan_license(image_base64)
+            # Scan the license (no base64 round-trip)
+            return self.scanner.scan_license_bytes(image_bytes)
             
         except Exception as e:
             logger.error(f"Error scanning from bytes: {e}")
@@ -162,7 +191,7 @@ class LicenseScannerAPI:
         Returns:
             List of state abbreviations
         """
-        return sorted(list(self.scanner.US_STATES))
+        return list(self.scanner.SORTED_US_STATES)
     
     def get_state_pattern(self, state: str) -> str:
         """
@@ -187,8 +216,8 @@ def main():
     
     args = parser.parse_args()
     
-    # Initialize API
-    api = LicenseScannerAPI()
+    # Initialize API (the CLI runs locally, so use full PIL validation)
+    api = LicenseScannerAPI(validator='pil')
     
     # Scan the license
     result = api.scan_from_file(args.image_path)
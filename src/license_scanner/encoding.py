@@ -0,0 +1,18 @@
+"""
+Base64 helpers for the license scanner
+
+Uses the SIMD-accelerated pybase64 codec when it is installed and falls back
+to the standard library otherwise.
+"""
+
+try:
+    from pybase64 import b64decode, b64encode_as_string
+except ImportError:
+    import base64
+    from base64 import b64decode
+
+    def b64encode_as_string(data: bytes) -> str:
+        """Base64 encode bytes and return the result as a str"""
+        return base64.b64encode(data).decode('ascii')
+
+__all__ = ["b64decode", "b64encode_as_string"]
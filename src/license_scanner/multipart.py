@@ -0,0 +1,49 @@
+"""
+multipart/form-data parsing for raw request bodies
+
+Uses the Cython-accelerated streaming_form_data parser when it is installed
+and falls back to the standard library email parser otherwise.
+"""
+
+from typing import Optional
+
+try:
+    from streaming_form_data import StreamingFormDataParser
+    from streaming_form_data.targets import ValueTarget
+except ImportError:
+    StreamingFormDataParser = None
+    from email import policy
+    from email.parser import BytesParser
+
+def extract_form_file(body: bytes, content_type: str, field_name: str = 'image') -> Optional[bytes]:
+    """
+    Extract the contents of one field from a multipart/form-data body
+    
+    Args:
+        body: Raw request body
+        content_type: Request Content-Type header, including the boundary
+        field_name: Name of the form field to extract
+        
+    Returns:
+        The field contents, or None if the field is missing or empty
+    """
+    if StreamingFormDataParser is not None:
+        target = ValueTarget()
+        parser = StreamingFormDataParser(headers={'Content-Type': content_type})
+        parser.register(field_name, target)
+        parser.data_received(body)
+        return target.value or None
+    
+    message = BytesParser(policy=policy.HTTP).parsebytes(
+        b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+    )
+    if not message.is_multipart():
+        return None
+    
+    for part in message.iter_parts():
+        if part.get_param('name', header='content-disposition') == field_name:
+            return part.get_payload(decode=True) or None
+    
+    return None
+
+__all__ = ["extract_form_file"]
@@ -0,0 +1,25 @@
+"""
+JSON helpers for the license scanner
+
+Uses the orjson codec when it is installed and falls back to the standard
+library otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize a response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    return json.dumps(obj, indent=2 if indent else None)
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+json_loads = orjson.loads if orjson is not None else json.loads
+
+__all__ = ["json_dumps", "json_loads"]
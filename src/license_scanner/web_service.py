@@ -6,8 +6,10 @@ A simple Flask web service for the driver's license scanner agent.
 Provides REST API endpoints for scanning licenses.
 """
 
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request
 from .api import LicenseScannerAPI
+from .scanner import get_scanner
+from .serialization import json_dumps
 import base64
 import os
 import logging
@@ -18,9 +20,13 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+def json_response(obj, status: int = 200):
+    """Build a JSON response, serialized with json_dumps rather than flask.jsonify"""
+    return app.response_class(json_dumps(obj), status=status, mimetype='application/json')
+
 # Initialize API with region (can be overridden by environment variable)
 region = os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
-api = LicenseScannerAPI(region_name=region)
+api = LicenseScannerAPI(validator='pil', scanner=get_scanner(region))
 
 # HTML template for the web interface
 HTML_TEMPLATE = """
@@ -124,10 +130,28 @@ HTML_TEMPLATE = """
 </html>
 """
 
+# Static response bodies, built and encoded once at startup instead of per request
+INDEX_HTML = HTML_TEMPLATE.encode('utf-8')  # Plain HTML, no template markup to render
+
+# The page never changes while the service runs, so browsers may reuse it
+INDEX_HEADERS = {'Cache-Control': 'public, max-age=3600'}
+
+SUPPORTED_STATES = api.get_supported_states()
+STATES_BODY = json_dumps({
+    'states': SUPPORTED_STATES,
+    'count': len(SUPPORTED_STATES)
+})
+
+HEALTH_BODY = json_dumps({
+    'status': 'healthy',
+    'service': 'Driver\'s License Scanner',
+    'version': '1.0.0'
+})
+
 @app.route('/')
 def index():
     """Serve the web interface"""
-    return render_template_string(HTML_TEMPLATE)
+    return app.response_class(INDEX_HTML, mimetype='text/html', headers=INDEX_HEADERS)
 
 @app.route('/scan', methods=['POST'])
 def scan_license():
@@ -139,17 +163,17 @@ def scan_license():
     """
     try:
         if 'image' not in request.files:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'No image file provided'
-            }), 400
+            }, 400)
         
         file = request.files['image']
         if file.filename == '':
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'No file selected'
-            }), 400
+            }, 400)
         
         # Read image bytes
         image_bytes = file.read()
@@ -157,14 +181,14 @@ def scan_license():
         # Scan the license
         result = api.scan_from_bytes(image_bytes)
         
-        return jsonify(result)
+        return json_response(result)
         
     except Exception as e:
         logger.error(f"Error in scan endpoint: {e}")
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/scan/base64', methods=['POST'])
 def scan_license_base64():
@@ -183,22 +207,22 @@ def scan_license_base64():
         data = request.get_json()
         
         if not data or 'image_data' not in data:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'Missing image_data in request body'
-            }), 400
+            }, 400)
         
         # Scan the license
         result = api.scan_from_base64(data['image_data'])
         
-        return jsonify(result)
+        return json_response(result)
         
     except Exception as e:
         logger.error(f"Error in base64 scan endpoint: {e}")
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/states', methods=['GET'])
 def get_states():
@@ -208,10 +232,7 @@ def get_states():
     Returns:
         JSON list of state abbreviations
     """
-    return jsonify({
-        'states': api.get_supported_states(),
-        'count': len(api.get_supported_states())
-    })
+    return app.response_class(STATES_BODY, mimetype='application/json')
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -221,27 +242,23 @@ def health_check():
     Returns:
         JSON response with service status
     """
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Driver\'s License Scanner',
-        'version': '1.0.0'
-    })
+    return app.response_class(HEALTH_BODY, mimetype='application/json')
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return jsonify({
+    return json_response({
         'success': False,
         'error': 'Endpoint not found'
-    }), 404
+    }, 404)
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    return jsonify({
+    return json_response({
         'success': False,
         'error': 'Internal server error'
-    }), 500
+    }, 500)
 
 if __name__ == '__main__':
     print("🚀 Starting Driver's License Scanner Web Service...")
@@ -252,4 +269,4 @@ if __name__ == '__main__':
     print("   GET /states - Get supported states")
     print("   GET /health - Health check")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=False, threaded=True, host='0.0.0.0', port=5000)
\ No newline at end of file
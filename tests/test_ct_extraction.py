@@ -5,6 +5,7 @@ Test Connecticut license number extraction specifically
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -29,19 +30,25 @@ def test_ct_extraction():
     print("🧪 Testing Connecticut License Number Extraction")
     print("=" * 50)
     
-    for i, (text, expected) in enumerate(test_cases, 1):
-        result = scanner.extract_license_number(text, "CT")
+    # Run the extractions concurrently; map keeps the results in case order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda case: scanner.extract_license_number(case[0], "CT"), test_cases))
+    
+    # Collect the report lines and write them in one go
+    lines = []
+    for i, ((text, expected), result) in enumerate(zip(test_cases, results), 1):
         status = "✅" if result == expected else "❌"
         
-        print(f"\nTest {i}: {status}")
-        print(f"Input text: {repr(text)}")
-        print(f"Expected: {expected}")
-        print(f"Got: {result}")
+        lines.append(f"\nTest {i}: {status}")
+        lines.append(f"Input text: {repr(text)}")
+        lines.append(f"Expected: {expected}")
+        lines.append(f"Got: {result}")
         
         if result != expected:
-            print(f"❌ FAILED: Expected {expected}, got {result}")
+            lines.append(f"❌ FAILED: Expected {expected}, got {result}")
         else:
-            print(f"✅ PASSED")
+            lines.append(f"✅ PASSED")
+    print("\n".join(lines))
 
 if __name__ == "__main__":
     test_ct_extraction()
\ No newline at end of file